@@ -46,6 +46,8 @@ default_args = argparse.Namespace( # pragma: no cover
         processes       = multiprocessing.cpu_count(),
         initializer     = '',
         finalizer       = '',
+        maxtasksperchild = 0,
+        pin_workers     = False,
         termcolor       = None,
         notermcolor     = None,
         allow_stdout    = False,
@@ -186,6 +188,26 @@ def parseArguments(): # pragma: no cover
             help="Same as --initializer, only run at the end of a worker "
             "process's lifetime.  Used to unprovision resources provisioned by "
             "the initializer."))
+    store_opt(
+        concurrency_args.add_argument('-m', '--maxtasksperchild',
+            action='store', type=int, metavar='NUM',
+            help="Number of batches of tests a worker process runs before it "
+            "is replaced by a fresh worker process.  Default is 0, meaning "
+            "worker processes live for the entire test run, which avoids the "
+            "overhead of starting new processes and re-importing modules.  "
+            "Only use this to contain tests that leak memory or other "
+            "resources.",
+        default=argparse.SUPPRESS))
+    store_opt(
+        concurrency_args.add_argument('-P', '--pin-workers',
+            action='store_true',
+            help="Pin each worker process to a CPU of its own, so it keeps "
+            "its CPU caches warm instead of migrating between CPUs.  Only "
+            "done on Linux, and only when there are at least as many CPUs "
+            "available as worker processes.  Off by default, since pinned "
+            "workers can't move away from CPUs that other programs are busy "
+            "with.",
+        default=argparse.SUPPRESS))
     format_args = parser.add_argument_group("Format Options")
     store_opt(format_args.add_argument('-t', '--termcolor', action='store_true',
         help="Force terminal colors on.  Default is to autodetect.",
@@ -384,9 +406,9 @@ def mergeConfig(args, testing=False, coverage_testing=False): # pragma: no cover
         if name in ['termcolor', 'notermcolor', 'allow_stdout', 'help',
                 'logging', 'version', 'failfast', 'run_coverage', 'options',
                 'completions', 'completion_file', 'clear_omit',
-                'no_skip_report']:
+                'no_skip_report', 'pin_workers']:
             config_getter = config.getboolean
-        elif name in ['processes', 'debug', 'verbose']:
+        elif name in ['processes', 'debug', 'verbose', 'maxtasksperchild']:
             config_getter = config.getint
         elif name in ['file_pattern', 'finalizer', 'initializer',
                 'omit_patterns', 'warnings', 'test_pattern']:
@@ -1,12 +1,31 @@
+import copy
+import importlib
 import logging
 import multiprocessing
-from multiprocessing.pool import Pool
+from multiprocessing.pool import Pool, RUN, TERMINATE
 import os
-import random
+import pickle
+import select
 import shutil
+import struct
 import sys
 import tempfile
+import threading
 import traceback
+import unittest
+
+try: # pragma: no cover
+    from multiprocessing.connection import wait
+except: # pragma: no cover
+    # Python 2 doesn't have connection.wait()
+    def wait(object_list, timeout=None):
+        return select.select(object_list, [], [], timeout)[0]
+
+try: # pragma: no cover
+    import selectors
+except: # pragma: no cover
+    # Python 2 doesn't have selectors
+    selectors = None
 
 try: # pragma: no cover
     import coverage
@@ -16,7 +35,46 @@ except: # pragma: no cover
 from green.exceptions import InitializerOrFinalizerError
 from green.loader import loadTargets
 from green.result import proto_test, ProtoTest, ProtoTestResult
+from green.suite import GreenTestSuite
+
+
+# poolRunner sends test events to the main process in lists of (at most) this
+# many events, instead of one queue round trip per event.
+event_buffer_size = 64
 
+# The write end of this pool worker process's result pipe
+worker_connection = None
+
+
+def sendPickled(connection, obj):
+    """
+    I pickle obj and send it over connection.  With pickle protocol 5+, large
+    buffers (like big captured output) are sent out-of-band as messages of
+    their own instead of being copied into the pickle.  The number of buffer
+    messages goes first in a message of its own, so that the pickle doesn't
+    have to be copied to put the count in front of it.
+    """
+    buffers = []
+    if pickle.HIGHEST_PROTOCOL >= 5:
+        data = pickle.dumps(obj, 5, buffer_callback=buffers.append)
+    else: # pragma: no cover
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    connection.send_bytes(struct.pack('!I', len(buffers)))
+    connection.send_bytes(data)
+    for buffer in buffers:
+        connection.send_bytes(buffer.raw())
+
+
+def recvPickled(connection):
+    """
+    I receive and unpickle an object sent by sendPickled()
+    """
+    num_buffers = struct.unpack('!I', connection.recv_bytes())[0]
+    data = connection.recv_bytes()
+    if not num_buffers:
+        return pickle.loads(data)
+    buffers = [connection.recv_bytes() for i in range(num_buffers)]
+    return pickle.loads(data, buffers=buffers)
 
 
 # Super-useful debug function for finding problems in the subprocesses, and it
@@ -46,6 +104,10 @@ class ProcessLogger(object):
         self.__callable = callable
 
 
+    def __reduce__(self):
+        return (ProcessLogger, (self.__callable,))
+
+
     def __call__(self, *args, **kwargs):
         try:
             result = self.__callable(*args, **kwargs)
@@ -86,33 +148,264 @@ class DaemonlessProcess(multiprocessing.Process):
 
 
 
+def allowedCpus():
+    """
+    I return a sorted list of the CPUs this process may run on, or an empty
+    list if the OS won't tell us (anything but Linux).
+    """
+    if not hasattr(os, 'sched_getaffinity'): # pragma: no cover
+        return []
+    return sorted(os.sched_getaffinity(0))
+
+
+def pinToCpu(worker_id):
+    """
+    I pin this process to one of the CPUs it may run on, picked by worker_id,
+    so that a worker keeps its caches warm instead of migrating between CPUs.
+    """
+    cpus = allowedCpus()
+    if not cpus: # pragma: no cover
+        return
+    try:
+        os.sched_setaffinity(0, [cpus[worker_id % len(cpus)]])
+    except OSError: # pragma: no cover
+        pass
+
+
+
+class WorkerProcess(DaemonlessProcess):
+    """
+    I am a LoggingDaemonlessPool worker.  Once I have started, I close the main
+    process's copy of the write end of my result pipe, so that the main process
+    sees EOF on the read end when I exit.
+    """
+
+
+    def __init__(self, result_writer, start_method=None, worker_id=None,
+                 *args, **kwargs):
+        super(WorkerProcess, self).__init__(*args, **kwargs)
+        self._result_writer = result_writer
+        self._worker_start_method = start_method
+        self.worker_id = worker_id
+
+
+    def _Popen(self, process_obj):
+        """
+        Start the process the way our pool's context does (Python 3.4+)
+        """
+        context = multiprocessing.get_context(self._worker_start_method)
+        return context.Process._Popen(process_obj)
+
+
+    def start(self):
+        super(WorkerProcess, self).start()
+        self._result_writer.close()
+
+
+    def run(self):
+        if self.worker_id is not None:
+            pinToCpu(self.worker_id)
+        super(WorkerProcess, self).run()
+
+
+
+class ResultChannel(object):
+    """
+    I am handed to poolRunner in place of a queue.  Whatever is put on me is
+    sent to the main process over the result pipe of the worker process I end
+    up in, and LoggingDaemonlessPool puts it on the queue I was made for.
+    """
+
+
+    def __init__(self, channel_id):
+        self.channel_id = channel_id
+
+
+    def put(self, obj):
+        sendPickled(worker_connection, (self.channel_id, obj))
+
+
+
 class LoggingDaemonlessPool(Pool):
     """
-    I use ProcessLogger and DaemonlessProcess to make a pool of workers.
+    I use ProcessLogger and WorkerProcess to make a pool of workers.
+
+    Workers are long-lived by default (maxtasksperchild=None).  Replacing a
+    worker means starting a new process that has to re-import everything its
+    tests need, so only set maxtasksperchild to guard against tests that leak
+    memory.  Modules named in preload are imported by each worker before the
+    initializer runs.
+
+    Each worker gets its own result pipe.  Use resultChannel() to get
+    something to hand to a task in place of a queue.
+
+    Where the OS supports it and there are enough CPUs to go around, each
+    worker is pinned to a CPU of its own.
     """
 
-    Process = DaemonlessProcess
+    def Process(self, *args, **kwds):
+        """
+        I make a WorkerProcess that runs our worker() with the finalizer,
+        preload and result pipe arguments added on.  Python 3.8+ replaces
+        exited workers from a static method that passes in a context as the
+        first argument and only the standard worker arguments, so I ignore any
+        positional arguments and fill in the rest.
+        """
+        reader, writer = multiprocessing.Pipe(False)
+        with self._result_lock:
+            self._result_readers.append(reader)
+            if self._result_selector:
+                self._result_selector.register(reader, selectors.EVENT_READ)
+        worker_args = tuple(kwds.get('args', ()))[:6] + (
+                self._finalizer, self._finalargs, self._preload, writer)
+        return WorkerProcess(writer, self._start_method, self._nextWorkerId(),
+                             target=worker, args=worker_args)
+
+
+    def _nextWorkerId(self):
+        """
+        When pinning is turned on, workers are pinned to CPUs by worker id, so
+        a replacement worker takes the lowest id that no living worker has.  If
+        pinning is off, or there are more workers than CPUs to run them on, I
+        return None and workers aren't pinned.
+        """
+        if not self._pin_workers or self._processes > len(allowedCpus()):
+            return None
+        taken = set(w.worker_id for w in self._pool)
+        worker_id = 0
+        while worker_id in taken:
+            worker_id += 1
+        return worker_id
+
+
+    def resultChannel(self, queue):
+        """
+        Returns a ResultChannel.  Whatever a task puts on it ends up on queue,
+        which should be a queue in this process.  Putting None on the channel
+        is the last thing a task may do with it.
+        """
+        with self._result_lock:
+            channel_id = self._next_channel_id
+            self._next_channel_id += 1
+            self._result_queues[channel_id] = queue
+        return ResultChannel(channel_id)
 
 
     def apply_async(self, func, args=(), kwds={}, callback=None):
-        return Pool.apply_async(
-                self, ProcessLogger(func), args, kwds, callback)
+        wrapper = self._wrapper_cache.get(func)
+        if wrapper is None:
+            wrapper = self._wrapper_cache.setdefault(func, ProcessLogger(func))
+        return Pool.apply_async(self, wrapper, args, kwds, callback)
+
+
+    def _handle_result_pipes(self):
+        """
+        I run in a thread, and dispatch whatever workers send over their result
+        pipes to the queues their ResultChannels were made for.  Where there is
+        a selector for pipes, workers' pipes stay registered with it for their
+        whole lifetime, so each wakeup only costs as much as the pipes that are
+        ready.
+        """
+        while self._state != TERMINATE:
+            with self._result_lock:
+                readers = list(self._result_readers)
+                # Once the pool is closed, we're done when every task has
+                # finished with its channel and every worker has exited.
+                if (self._state != RUN and not self._result_queues
+                        and not readers):
+                    break
+            # Wake up regularly to notice the pool being closed (and, without a
+            # selector, to pick up pipes of replacement workers)
+            if self._result_selector:
+                ready = [key.fileobj for key, events in
+                         self._result_selector.select(0.1)]
+            else: # pragma: no cover
+                ready = wait(readers, 0.1)
+            for reader in ready:
+                try:
+                    channel_id, obj = recvPickled(reader)
+                except (EOFError, PortableOSError):
+                    # The worker exited
+                    with self._result_lock:
+                        self._result_readers.remove(reader)
+                        if self._result_selector:
+                            self._result_selector.unregister(reader)
+                    reader.close()
+                    continue
+                with self._result_lock:
+                    if obj is None:
+                        queue = self._result_queues.pop(channel_id)
+                    else:
+                        queue = self._result_queues[channel_id]
+                queue.put(obj)
+        with self._result_lock:
+            if self._result_selector:
+                self._result_selector.close()
+                self._result_selector = None
+
 
 #-------------------------------------------------------------------------------
-# START of Worker Finalization Monkey Patching
+# START of Worker Finalization
 #
 # I started with code from cpython/Lib/multiprocessing/pool.py from version
 # 3.5.0a4+ of the main python mercurial repository.  Then altered it to run on
-# 2.7+ and added the finalizer/finalargs parameter handling.
+# 2.7+ and added the finalizer/finalargs parameter handling.  Only
+# LoggingDaemonlessPool workers run our worker(), the multiprocessing module
+# itself is left alone.
     _wrap_exception = True
 
     def __init__(self, processes=None, initializer=None, initargs=(),
                  maxtasksperchild=None, context=None, finalizer=None,
-                 finalargs=()):
+                 finalargs=(), preload=(), pin_workers=False):
         self._finalizer = finalizer
         self._finalargs = finalargs
-        super(LoggingDaemonlessPool, self).__init__(processes, initializer,
-                initargs, maxtasksperchild)
+        self._preload = tuple(preload)
+        self._pin_workers = pin_workers
+        self._result_lock = threading.Lock()
+        self._result_readers = []
+        # Windows pipes can't be used with selectors
+        if selectors and sys.platform != 'win32':
+            self._result_selector = selectors.DefaultSelector()
+        else: # pragma: no cover
+            self._result_selector = None
+        self._result_queues = {}
+        self._next_channel_id = 0
+        self._wrapper_cache = {}
+        self._start_method = None
+        if not hasattr(multiprocessing, 'get_context'): # pragma: no cover
+            # Python 2 only knows how to fork (or spawn, on Windows)
+            super(LoggingDaemonlessPool, self).__init__(processes,
+                    initializer, initargs, maxtasksperchild)
+        else:
+            context = context or self._defaultContext()
+            self._start_method = context.get_start_method()
+            super(LoggingDaemonlessPool, self).__init__(processes,
+                    initializer, initargs, maxtasksperchild, context)
+        self._pipe_handler = threading.Thread(
+                target=self._handle_result_pipes)
+        self._pipe_handler.daemon = True
+        self._pipe_handler.start()
+
+
+    def _defaultContext(self):
+        """
+        Where the platform default is to spawn workers (macOS, Python 3.8+),
+        every worker would have to start a new interpreter and import green
+        (and the main module) all over again.  I use a forkserver instead when
+        there is one: a server process imports green once, and workers are
+        forked from it.  Where the default is to fork, or already to use a
+        forkserver, I leave it alone.
+
+        The forkserver's preload list belongs to the whole interpreter, not to
+        the pool, so I only set it when I picked the forkserver myself.
+        """
+        context = multiprocessing.get_context()
+        if (context.get_start_method() == 'spawn' and
+                'forkserver' in multiprocessing.get_all_start_methods()):
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload(
+                    ['green.process'] + list(self._preload))
+        return context
 
 
     def _repopulate_pool(self):
@@ -121,14 +414,10 @@ class LoggingDaemonlessPool(Pool):
         after reaping workers which have exited.
         """
         for i in range(self._processes - len(self._pool)):
-            w = self.Process(target=worker,
-                             args=(self._inqueue, self._outqueue,
+            w = self.Process(args=(self._inqueue, self._outqueue,
                                    self._initializer,
                                    self._initargs, self._maxtasksperchild,
-                                   self._wrap_exception,
-                                   self._finalizer,
-                                   self._finalargs)
-                            )
+                                   self._wrap_exception))
             self._pool.append(w)
             w.name = w.name.replace('Process', 'PoolWorker')
             w.daemon = True
@@ -137,7 +426,6 @@ class LoggingDaemonlessPool(Pool):
 
 
 import platform
-import multiprocessing.pool
 from multiprocessing import util
 from multiprocessing.pool import MaybeEncodingError
 
@@ -149,7 +437,10 @@ else: # pragma: no cover
 
 
 def worker(inqueue, outqueue, initializer=None, initargs=(), maxtasks=None,
-        wrap_exception=False, finalizer=None, finalargs=()): # pragma: no cover
+        wrap_exception=False, finalizer=None, finalargs=(),
+        preload=(), connection=None): # pragma: no cover
+    global worker_connection
+    worker_connection = connection
     assert maxtasks is None or (type(maxtasks) == int and maxtasks > 0)
     put = outqueue.put
     get = inqueue.get
@@ -157,6 +448,12 @@ def worker(inqueue, outqueue, initializer=None, initargs=(), maxtasks=None,
         inqueue._writer.close()
         outqueue._reader.close()
 
+    for module_name in preload:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            print(str(e))
+
     if initializer is not None:
         try:
             initializer(*initargs)
@@ -209,13 +506,24 @@ class RemoteTraceback(Exception): # pragma: no cover
         return self.tb
 
 
-# Unmodified (see above)
+# Modified to only format the traceback once it is needed (when pickled), and
+# to leave out the frames of the worker machinery that ran the task
 class ExceptionWithTraceback: # pragma: no cover
     def __init__(self, exc, tb):
-        tb = traceback.format_exception(type(exc), exc, tb)
-        tb = ''.join(tb)
         self.exc = exc
-        self.tb = '\n"""\n%s"""' % tb
+        self._tb = tb
+        self._formatted_tb = None
+    @property
+    def tb(self):
+        if self._formatted_tb is None:
+            tb = self._tb
+            while tb and tb.tb_frame.f_code in (
+                    worker.__code__, ProcessLogger.__call__.__code__):
+                tb = tb.tb_next
+            tb = traceback.format_exception(type(self.exc), self.exc, tb)
+            self._formatted_tb = '\n"""\n%s"""' % ''.join(tb)
+            self._tb = None
+        return self._formatted_tb
     def __reduce__(self):
         return rebuild_exc, (self.exc, self.tb)
 
@@ -225,95 +533,249 @@ def rebuild_exc(exc, tb): # pragma: no cover
     exc.__cause__ = RemoteTraceback(tb)
     return exc
 
-multiprocessing.pool.worker = worker
-# END of Worker Finalization Monkey Patching
+# END of Worker Finalization
 #-------------------------------------------------------------------------------
 
 
-def poolRunner(target, queue, coverage_number=None, omit_patterns=[]): # pragma: no cover
+# The coverage instance of this pool worker process, if coverage is being run.
+worker_coverage = None
+# The temp directory of this pool worker process, shared by all of its tests.
+worker_tempdir = None
+
+
+def poolInitializer(coverage_number=None, omit_patterns=[], initializer=None): # pragma: no cover
     """
-    I am the function that pool worker processes run.  I run one unit test.
+    I am run once at the start of each pool worker process.  I create the
+    worker's temp directory, start the worker's coverage (if any), and then run
+    the user's initializer (if any).
     """
+    global worker_coverage, worker_tempdir
     # Each pool worker gets his own temp directory, to avoid having tests that
     # are used to taking turns using the same temp file name from interfering
     # with eachother.  So long as the test doesn't use a hard-coded temp
     # directory, anyway.
-    saved_tempdir = tempfile.tempdir
-    tempfile.tempdir = tempfile.mkdtemp()
+    worker_tempdir = tempfile.mkdtemp(prefix='green_worker_')
 
-    # Each pool starts its own coverage, later combined by the main process.
+    # Each pool worker starts its own coverage, later combined by the main
+    # process.  Coverage suffixes the data file name with the host name,
+    # process id and a random number, so that a worker that reuses the process
+    # id of an earlier one doesn't overwrite its data.
     if coverage_number and coverage:
-        cov = coverage.coverage(
-                data_file='.coverage.{}_{}'.format(
-                    coverage_number, random.randint(0, 10000)),
-                omit=omit_patterns)
-        cov._warn_no_data = False
-        cov.start()
+        worker_coverage = coverage.coverage(
+                data_file='.coverage.{}'.format(coverage_number),
+                data_suffix=True, omit=omit_patterns)
+        worker_coverage._warn_no_data = False
+        worker_coverage.start()
+
+    if initializer:
+        initializer()
+
+
+def poolFinalizer(finalizer=None): # pragma: no cover
+    """
+    I am run once at the end of each pool worker process.  I run the user's
+    finalizer (if any), and then finish the worker's coverage (if any) and
+    remove the worker's temp directory.
+    """
+    global worker_coverage, worker_tempdir
+    try:
+        if finalizer:
+            finalizer()
+    finally:
+        if worker_coverage:
+            worker_coverage.stop()
+            worker_coverage.save()
+            worker_coverage = None
+        if worker_tempdir:
+            shutil.rmtree(worker_tempdir, ignore_errors=True)
+            worker_tempdir = None
+
+
+# The tests the main process had already loaded for each target, as lists of
+# (TestCase class, method name) pairs.  Filled in by seedWorkerTargets() before
+# the workers are forked.
+worker_loaded_tests = {}
+
+
+def iterTests(suite):
+    """
+    I yield all the individual tests in a (possibly nested) test suite.
+    """
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            for subtest in iterTests(test):
+                yield subtest
+        else:
+            yield test
+
+
+def loadWorkerTargets(target):
+    """
+    I am loadTargets() for a single target in a pool worker process.  If the
+    main process already loaded the target's tests, I make fresh TestCases
+    from them instead of searching for, importing and discovering the target
+    again.
+    """
+    if target in worker_loaded_tests:
+        return GreenTestSuite([test_class(method_name)
+            for test_class, method_name in worker_loaded_tests[target]])
+    return loadTargets(target)
+
+
+def reloadableTests(tests):
+    """
+    I return the (TestCase class, method name) pairs to make fresh copies of
+    tests with, or None if that wouldn't give the same tests.  That is the case
+    if any of them isn't a plain TestCase, appears more than once, or has had
+    something set on it that a freshly made TestCase wouldn't have.
+    """
+    pairs = []
+    seen = set()
+    for test in tests:
+        test_class = type(test)
+        if test_class.__init__ != unittest.TestCase.__init__:
+            return None
+        pair = (test_class, test._testMethodName)
+        if pair in seen:
+            return None
+        seen.add(pair)
+        # The ProtoTest that proto_test() remembers on a test is made again
+        # for the fresh one
+        state = dict(test.__dict__)
+        state.pop('_proto_cached', None)
+        try:
+            if state != test_class(test._testMethodName).__dict__:
+                return None
+        except Exception:
+            return None
+        pairs.append(pair)
+    return pairs
+
+
+def seedWorkerTargets(suite, targets):
+    """
+    I am run in the main process before the pool's workers are started, with
+    the suite that was loaded there and the parallel targets it was split into.
+    The tests of each target that is a module go into worker_loaded_tests, so
+    that workers forked from the main process run them without loading the
+    target again.  Other targets, and all targets when workers aren't forked,
+    are loaded by the workers as usual.
+    """
+    worker_loaded_tests.clear()
+    module_tests = {}
+    for test in iterTests(suite):
+        module_tests.setdefault(type(test).__module__, []).append(test)
+    for target in targets:
+        if target not in module_tests:
+            continue
+        # Loading a package discovers everything in it, not just its own tests
+        if hasattr(sys.modules.get(target), '__path__'):
+            continue
+        # A module's load_tests can return any tests it likes
+        if hasattr(sys.modules.get(target), 'load_tests'):
+            continue
+        pairs = reloadableTests(module_tests[target])
+        if pairs is not None:
+            worker_loaded_tests[target] = pairs
+
+
+def poolRunner(targets, queue): # pragma: no cover
+    """
+    I am the function that pool worker processes run.  I run a batch of unit
+    test targets, one after the other, so that the cost of dispatching work to
+    a worker is paid once per batch instead of once per target.
+    """
+    # If a string was passed in, put it into a list.
+    if type(targets) != list:
+        targets = [targets]
+
+    # Tests use the worker's temp directory, which poolInitializer created
+    saved_tempdir = tempfile.tempdir
+    tempfile.tempdir = worker_tempdir
+
+    # Test events are buffered and sent to the main process as lists of
+    # ('start', ProtoTest) and ('stop', ProtoTestResult) tuples.
+    events = []
+
+    def flush_events():
+        if events:
+            queue.put(list(events))
+            del events[:]
 
     # What to do each time an individual test is started
     def start_callback(test):
+        # The suite records a test's captured output after the test stops, so
+        # the buffer is only sent once the next test starts.
+        if len(events) >= event_buffer_size:
+            flush_events()
         # Let the main process know what test we are starting
-        queue.put(proto_test(test))
+        events.append(('start', proto_test(test)))
 
     def stop_callback(test_result):
-        # Let the main process know what happened with the test run
-        queue.put(test_result)
-
-    result = ProtoTestResult(start_callback, stop_callback)
-    test = None
-    try:
-        test = loadTargets(target)
-    except:
-        err = sys.exc_info()
-        t             = ProtoTest()
-        t.module      = 'green.loader'
-        t.class_name  = 'N/A'
-        t.description = 'Green encountered an error loading the unit test.'
-        t.method_name = 'poolRunner'
-        result.startTest(t)
-        result.addError(t, err)
-        result.stopTest(t)
-
-    if getattr(test, 'run', False):
-        # Loading was successful, lets do this
+        # Let the main process know what happened with the test run.  The
+        # result object gets reinitialized for the next test, so we buffer a
+        # copy of it.  The copy shares the output dicts that the test's
+        # captured output is about to be recorded in.
+        events.append(('stop', copy.copy(test_result)))
+
+    for target in targets:
+        # Each target gets a result of its own, like it would if it were run
+        # on its own.  A suite run records the last test class it ran on its
+        # result, and would tear down the previous target's class and module
+        # fixtures again.
+        result = ProtoTestResult(start_callback, stop_callback)
+        test = None
         try:
-            test.run(result)
+            test = loadWorkerTargets(target)
         except:
-            # Some frameworks like testtools record the error AND THEN let it
-            # through to crash things.  So we only need to manufacture another error
-            # if the underlying framework didn't, but either way we don't want to
-            # crash.
-            if not result.errors:
-                err = sys.exc_info()
-                t             = ProtoTest()
-                t.module      = 'green.runner'
-                t.class_name  = 'N/A'
-                t.description = 'Green encountered an exception not caught by the underlying test framework.'
-                t.method_name = 'poolRunner'
-                result.startTest(t)
-                result.addError(t, err)
-                result.stopTest(t)
-    else:
-        # loadTargets() returned an object without a run() method, probably None
-        description = 'Test loader returned an un-runnable object: {} of type {} with dir {}'.format(
-                str(test), type(test), dir(test))
-        err = (TypeError, TypeError(description), None)
-        t             = ProtoTest()
-        t.module      = '.'.join(target.split('.')[:-2])
-        t.class_name  = target.split('.')[-2]
-        t.description = description
-        t.method_name = target.split('.')[-1]
-        result.startTest(t)
-        result.addError(t, err)
-        result.stopTest(t)
-
-    # Finish coverage
-    if coverage_number and coverage:
-        cov.stop()
-        cov.save()
+            err = sys.exc_info()
+            t             = ProtoTest()
+            t.module      = 'green.loader'
+            t.class_name  = 'N/A'
+            t.description = 'Green encountered an error loading the unit test.'
+            t.method_name = 'poolRunner'
+            result.startTest(t)
+            result.addError(t, err)
+            result.stopTest(t)
+
+        run = getattr(test, 'run', None)
+        if run is not None:
+            # Loading was successful, lets do this
+            try:
+                run(result)
+            except:
+                # Some frameworks like testtools record the error AND THEN let
+                # it through to crash things.  So we only need to manufacture
+                # another error if the underlying framework didn't, but either
+                # way we don't want to crash.
+                if not result.errors:
+                    err = sys.exc_info()
+                    t             = ProtoTest()
+                    t.module      = 'green.runner'
+                    t.class_name  = 'N/A'
+                    t.description = 'Green encountered an exception not caught by the underlying test framework.'
+                    t.method_name = 'poolRunner'
+                    result.startTest(t)
+                    result.addError(t, err)
+                    result.stopTest(t)
+        else:
+            # loadTargets() returned an object without a run() method, probably
+            # None
+            description = 'Test loader returned an un-runnable object: {} of type {} with dir {}'.format(
+                    str(test), type(test), dir(test))
+            err = (TypeError, TypeError(description), None)
+            target_parts  = target.split('.')
+            t             = ProtoTest()
+            t.module      = '.'.join(target_parts[:-2])
+            t.class_name  = target_parts[-2]
+            t.description = description
+            t.method_name = target_parts[-1]
+            result.startTest(t)
+            result.addError(t, err)
+            result.stopTest(t)
 
     # Restore the state of the temp directory
-    shutil.rmtree(tempfile.tempdir)
     tempfile.tempdir = saved_tempdir
+    flush_events()
     queue.put(None)
     return None
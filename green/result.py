@@ -6,19 +6,38 @@ import time
 import traceback
 from unittest.result import failfast
 
+try: # pragma: no cover
+    from pickle import PickleBuffer
+except: # pragma: no cover
+    # Python < 3.8
+    PickleBuffer = None
+
 from green.output import Colors, debug
 from green.version import pretty_version
 
 
+# Captured output at least this long is handed to pickle protocol 5+ as a
+# buffer, so it can be sent between processes out-of-band.
+out_of_band_size = 4096
+
+
 def proto_test(test):
     """
     If test is a ProtoTest, I just return it.  Otherwise I create a ProtoTest
-    out of test and return it.
+    out of test and return it.  The ProtoTest is remembered on test, since a
+    test is turned into a ProtoTest several times while it runs.
     """
     if isinstance(test, ProtoTest):
         return test
-    else:
-        return ProtoTest(test)
+    cached = getattr(test, '__dict__', {}).get('_proto_cached')
+    if cached is not None:
+        return cached
+    cached = ProtoTest(test)
+    try:
+        test._proto_cached = cached
+    except AttributeError: # pragma: no cover
+        pass
+    return cached
 
 
 def proto_error(err):
@@ -180,6 +199,10 @@ class ProtoTestResult(BaseTestResult):
 
     def reinitialize(self):
         self.shouldStop = False
+        # New dicts, rather than cleared ones, so that a copy of the result of
+        # the previous test keeps the output captured from that test only.
+        self.stdout_output       = OrderedDict()
+        self.stderr_errput       = OrderedDict()
         self.errors              = []
         self.expectedFailures    = []
         self.failures            = []
@@ -208,6 +231,28 @@ class ProtoTestResult(BaseTestResult):
         return result_dict
 
 
+    def __reduce_ex__(self, protocol):
+        """
+        With pickle protocol 5+, large captured stdout and stderr are turned
+        into buffers of UTF-8 bytes, which can be pickled out-of-band.  The
+        pickler would encode the text anyway, but this way the encoded bytes
+        aren't also copied into the pickle.
+        """
+        reduced = super(ProtoTestResult, self).__reduce_ex__(protocol)
+        if not (PickleBuffer and protocol >= 5):
+            return reduced
+        state = reduced[2]
+        for output_attr in ['stdout_output', 'stderr_errput']:
+            outputs = OrderedDict()
+            for test, output in state[output_attr].items():
+                if len(output) >= out_of_band_size:
+                    output = PickleBuffer(
+                            output.encode('utf-8', 'surrogatepass'))
+                outputs[test] = output
+            state[output_attr] = outputs
+        return reduced[:2] + (state,) + reduced[3:]
+
+
     def __setstate__(self, dict):
         """
         Since the callback functions weren't pickled, we need to init them
@@ -215,6 +260,14 @@ class ProtoTestResult(BaseTestResult):
         self.__dict__.update(dict)
         self.start_callback = None
         self.stop_callback = None
+        # Turn captured output that was pickled as a buffer back into text,
+        # decoding it straight from the buffer it was received in
+        if PickleBuffer:
+            for output_attr in ['stdout_output', 'stderr_errput']:
+                outputs = getattr(self, output_attr)
+                for test, output in list(outputs.items()):
+                    if not isinstance(output, str):
+                        outputs[test] = str(output, 'utf-8', 'surrogatepass')
 
 
     def startTest(self, test):
@@ -1,6 +1,7 @@
 from __future__ import unicode_literals
 from __future__ import print_function
 
+from itertools import islice
 import multiprocessing
 from sys import modules
 from unittest.signals import (
@@ -12,10 +13,17 @@ try: # pragma: no cover
 except: # pragma: no cover
     coverage = None
 
+try: # pragma: no cover
+    from queue import Queue
+except: # pragma: no cover
+    from Queue import Queue
+
 from green.exceptions import InitializerOrFinalizerError
 from green.loader import toParallelTargets
 from green.output import GreenStream
-from green.process import LoggingDaemonlessPool, poolRunner
+from green.process import (
+        LoggingDaemonlessPool, poolRunner, poolInitializer, poolFinalizer,
+        seedWorkerTargets)
 from green.result import GreenTestResult
 
 
@@ -85,40 +93,67 @@ def run(suite, stream, args):
 
         result.startTestRun()
 
+        # Group the targets into batches, so each worker task runs several
+        # targets and the cost of dispatching a task is spread across them.
+        parallel_targets = toParallelTargets(suite, args.targets)
+        num_processes = args.processes or multiprocessing.cpu_count()
+        batch_size = max(1, len(parallel_targets) // (num_processes * 4))
+        targets_iter = iter(parallel_targets)
+        batches = []
+        while True:
+            batch = list(islice(targets_iter, batch_size))
+            if not batch:
+                break
+            batches.append((batch, Queue()))
+        # Workers forked below inherit the tests we already loaded
+        seedWorkerTargets(suite, parallel_targets)
+
+        # Each worker runs coverage (if requested) for its whole lifetime,
+        # wrapped around the user's initializer and finalizer.  Settings that
+        # are the same for every task go in initargs, which each worker gets
+        # once when it starts (for free, when workers are forked), so tasks
+        # themselves only carry their targets and result channel.
+        if args.run_coverage:
+            coverage_number = 1
+        else:
+            coverage_number = None
         pool = LoggingDaemonlessPool(processes=args.processes or None,
-                initializer=InitializerOrFinalizer(args.initializer),
-                finalizer=InitializerOrFinalizer(args.finalizer))
-        manager = multiprocessing.Manager()
-        targets = [(target, manager.Queue()) for target in toParallelTargets(suite, args.targets)]
-        if targets:
-            for index, (target, queue) in enumerate(targets):
-                if args.run_coverage:
-                    coverage_number = index + 1
-                else:
-                    coverage_number = None
+                maxtasksperchild=args.maxtasksperchild or None,
+                pin_workers=args.pin_workers,
+                initializer=poolInitializer,
+                initargs=(coverage_number, args.omit_patterns,
+                          InitializerOrFinalizer(args.initializer)),
+                finalizer=poolFinalizer,
+                finalargs=(InitializerOrFinalizer(args.finalizer),))
+        if batches:
+            for batch, queue in batches:
                 pool.apply_async(
-                    poolRunner,
-                    (target, queue, coverage_number, args.omit_patterns))
+                    poolRunner, (batch, pool.resultChannel(queue)))
             pool.close()
-            for target, queue in targets:
+            for batch, queue in batches:
                 abort = False
 
                 while True:
-                    msg = queue.get()
+                    events = queue.get()
 
                     # Sentinel value, we're done
-                    if not msg:
+                    if not events:
                         break
-                    else:
-                        # Result guarunteed after this message, we're
-                        # currently waiting on this test, so print out
-                        # the white 'processing...' version of the output
-                        result.startTest(msg)
-                        proto_test_result = queue.get()
-                        result.addProtoTestResult(proto_test_result)
-
-                    if result.shouldStop:
-                        abort = True
+
+                    for kind, msg in events:
+                        if kind == 'start':
+                            # Result guarunteed after this message, we're
+                            # currently waiting on this test, so print out
+                            # the white 'processing...' version of the output
+                            result.startTest(msg)
+                        else:
+                            result.addProtoTestResult(msg)
+
+                        if result.shouldStop:
+                            abort = True
+                            break
+
+                    if abort:
                         break
 
                 if abort:
@@ -1,6 +1,10 @@
+import multiprocessing
 import os
+import pickle
 import shutil
+import sys
 import tempfile
+import types
 from textwrap import dedent
 import unittest
 
@@ -9,8 +13,11 @@ try:
 except:
     from mock import MagicMock
 
-from green.process import ProcessLogger, DaemonlessProcess, poolRunner
+from green.process import (ProcessLogger, DaemonlessProcess,
+        LoggingDaemonlessPool, poolRunner, poolInitializer, poolFinalizer,
+        sendPickled, recvPickled)
 from green import process
+from green.loader import toParallelTargets
 
 try:
     from Queue import Queue
@@ -18,6 +25,58 @@ except:
     from queue import Queue
 
 
+
+#--- Helper stuff ---
+
+def _isImported(module_name):
+    """
+    Used by TestLoggingDaemonlessPool
+    """
+    return module_name in sys.modules
+
+
+def _getPid():
+    """
+    Used by TestLoggingDaemonlessPool
+    """
+    return os.getpid()
+
+
+def _getAffinity():
+    """
+    Used by TestLoggingDaemonlessPool
+    """
+    return sorted(os.sched_getaffinity(0))
+
+
+def _raiseError():
+    """
+    Used by TestLoggingDaemonlessPool
+    """
+    raise ValueError("from a task")
+
+
+def _putThings(channel):
+    """
+    Used by TestLoggingDaemonlessPool
+    """
+    channel.put(['something'])
+    channel.put(None)
+
+
+def _restoreWorkerLoadedTests(test):
+    """
+    Used by TestSeedWorkerTargets and TestPoolRunner.  When the test suite runs
+    in a pool worker, the worker's own seeded tests are put back afterwards.
+    """
+    saved_loaded_tests = dict(process.worker_loaded_tests)
+    test.addCleanup(process.worker_loaded_tests.update, saved_loaded_tests)
+    test.addCleanup(process.worker_loaded_tests.clear)
+
+#--- End of helper stuff
+
+
+
 class TestProcessLogger(unittest.TestCase):
 
 
@@ -53,6 +112,14 @@ class TestProcessLogger(unittest.TestCase):
         mock_get_logger.assert_any_call()
 
 
+    def test_pickle(self):
+        """
+        A pickled ProcessLogger still calls through to what it wraps
+        """
+        l = pickle.loads(pickle.dumps(ProcessLogger(_getPid)))
+        self.assertEqual(l(), os.getpid())
+
+
 
 class TestDaemonlessProcess(unittest.TestCase):
 
@@ -74,6 +141,432 @@ class TestDaemonlessProcess(unittest.TestCase):
 
 
 
+class TestSendPickled(unittest.TestCase):
+
+
+    def test_roundTrip(self):
+        """
+        Objects sent with sendPickled() are received by recvPickled()
+        """
+        reader, writer = process.multiprocessing.Pipe(False)
+        self.addCleanup(reader.close)
+        self.addCleanup(writer.close)
+        for obj in [None, ['small'], (1, bytearray(10000))]:
+            sendPickled(writer, obj)
+            self.assertEqual(recvPickled(reader), obj)
+
+
+
+class TestExceptionWithTraceback(unittest.TestCase):
+
+
+    def test_pickleRebuildsException(self):
+        """
+        The traceback is formatted when pickled and attached on unpickling
+        """
+        try:
+            raise ValueError("oops")
+        except ValueError as e:
+            ewt = process.ExceptionWithTraceback(e, sys.exc_info()[2])
+        self.assertEqual(ewt._formatted_tb, None)
+        exc = pickle.loads(pickle.dumps(ewt))
+        self.assertIsInstance(exc, ValueError)
+        self.assertIn('test_pickleRebuildsException', exc.__cause__.tb)
+
+
+
+class TestLoggingDaemonlessPool(unittest.TestCase):
+
+
+    def test_stdlibWorkerUntouched(self):
+        """
+        The multiprocessing module's own pool worker function is left alone
+        """
+        import multiprocessing.pool
+        self.assertIsNot(multiprocessing.pool.worker, process.worker)
+
+
+    def test_preload(self):
+        """
+        Modules to preload are imported in the worker processes
+        """
+        pool = LoggingDaemonlessPool(processes=1, preload=['colorsys'])
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        self.assertTrue(pool.apply_async(_isImported, ('colorsys',)).get(10))
+
+
+    def test_wrapperReused(self):
+        """
+        Tasks running the same function share one ProcessLogger
+        """
+        pool = LoggingDaemonlessPool(processes=1)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        pids = [pool.apply_async(_getPid) for i in range(3)]
+        self.assertEqual(len(set(p.get(10) for p in pids)), 1)
+        self.assertEqual(list(pool._wrapper_cache), [_getPid])
+        self.assertIsInstance(pool._wrapper_cache[_getPid], ProcessLogger)
+
+
+    @unittest.skipIf(sys.version_info[0] == 2,
+            "Python 2 doesn't send task tracebacks")
+    def test_taskTraceback(self):
+        """
+        A task's traceback starts at the task, not in the worker machinery
+        """
+        pool = LoggingDaemonlessPool(processes=1)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        try:
+            pool.apply_async(_raiseError).get(10)
+        except ValueError as e:
+            tb = e.__cause__.tb
+        self.assertIn('in _raiseError', tb)
+        self.assertNotIn('in worker', tb)
+        self.assertNotIn('in __call__', tb)
+
+
+    def test_resultChannel(self):
+        """
+        Things put on a result channel end up on its queue
+        """
+        pool = LoggingDaemonlessPool(processes=2)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        queues = [Queue(), Queue()]
+        for queue in queues:
+            pool.apply_async(_putThings, (pool.resultChannel(queue),))
+        for queue in queues:
+            self.assertEqual(queue.get(timeout=10), ['something'])
+            self.assertEqual(queue.get(timeout=10), None)
+
+
+    @unittest.skipIf(process.selectors is None or sys.platform == 'win32',
+            "no selector for pipes")
+    def test_resultSelector(self):
+        """
+        Each worker's result pipe is registered with the pool's selector
+        """
+        pool = LoggingDaemonlessPool(processes=2)
+        self.assertEqual(
+                sorted(key.fileobj.fileno() for key in
+                       pool._result_selector.get_map().values()),
+                sorted(reader.fileno() for reader in pool._result_readers))
+        queue = Queue()
+        pool.apply_async(_putThings, (pool.resultChannel(queue),))
+        self.assertEqual(queue.get(timeout=10), ['something'])
+        pool.close()
+        pool.join()
+        pool._pipe_handler.join(10)
+        self.assertEqual(pool._result_selector, None)
+
+
+    @unittest.skipUnless(hasattr(os, 'sched_getaffinity'),
+            "CPU affinity not supported")
+    def test_workersPinned(self):
+        """
+        With pinning on and a CPU for each worker, each worker is pinned to its
+        own CPU
+        """
+        cpus = process.allowedCpus()
+        pool = LoggingDaemonlessPool(processes=len(cpus), pin_workers=True)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        self.assertEqual(sorted(w.worker_id for w in pool._pool),
+                         list(range(len(cpus))))
+        self.assertEqual(len(pool.apply_async(_getAffinity).get(10)), 1)
+
+
+    @unittest.skipUnless(hasattr(os, 'sched_getaffinity'),
+            "CPU affinity not supported")
+    def test_workersNotPinnedByDefault(self):
+        """
+        Without pinning turned on, workers may run on any CPU
+        """
+        cpus = process.allowedCpus()
+        pool = LoggingDaemonlessPool(processes=len(cpus))
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        self.assertEqual([w.worker_id for w in pool._pool], [None] * len(cpus))
+        self.assertEqual(pool.apply_async(_getAffinity).get(10), cpus)
+
+
+    @unittest.skipUnless(hasattr(os, 'sched_getaffinity'),
+            "CPU affinity not supported")
+    def test_tooManyWorkersToPin(self):
+        """
+        With more workers than CPUs, workers are not pinned
+        """
+        cpus = process.allowedCpus()
+        pool = LoggingDaemonlessPool(processes=len(cpus) + 1,
+                                     pin_workers=True)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        self.assertEqual([w.worker_id for w in pool._pool],
+                         [None] * (len(cpus) + 1))
+        self.assertEqual(pool.apply_async(_getAffinity).get(10), cpus)
+
+
+    def test_maxtasksperchild(self):
+        """
+        Workers that have done maxtasksperchild tasks get replaced
+        """
+        pool = LoggingDaemonlessPool(processes=1, maxtasksperchild=1)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        pids = [pool.apply_async(_getPid).get(10) for i in range(3)]
+        self.assertEqual(len(set(pids)), 3)
+
+
+    @unittest.skipUnless(hasattr(multiprocessing, 'get_all_start_methods') and
+            'forkserver' in multiprocessing.get_all_start_methods(),
+            "forkserver start method not available")
+    def test_forkserverContext(self):
+        """
+        Workers are started with the given context, result channel and all
+        """
+        context = multiprocessing.get_context('forkserver')
+        pool = LoggingDaemonlessPool(processes=1, context=context)
+        self.addCleanup(pool.join)
+        self.addCleanup(pool.close)
+        self.assertEqual(pool._start_method, 'forkserver')
+        queue = Queue()
+        pool.apply_async(_putThings, (pool.resultChannel(queue),))
+        self.assertEqual(queue.get(timeout=10), ['something'])
+        self.assertEqual(queue.get(timeout=10), None)
+        self.assertNotEqual(pool.apply_async(_getPid).get(10), os.getpid())
+
+
+
+@unittest.skipUnless(hasattr(multiprocessing, 'get_context'),
+        "Python 2 has no start method contexts")
+class TestDefaultContext(unittest.TestCase):
+
+
+    def setUp(self):
+        self.contexts = {}
+        def get_context(method=None):
+            if method not in self.contexts:
+                self.contexts[method] = MagicMock()
+                self.contexts[method].get_start_method.return_value = (
+                        method or self.default_method)
+            return self.contexts[method]
+        saved_get_context = process.multiprocessing.get_context
+        process.multiprocessing.get_context = get_context
+        self.addCleanup(setattr, process.multiprocessing, 'get_context',
+                        saved_get_context)
+        self.pool = MagicMock()
+        self.pool._preload = ('colorsys',)
+
+
+    @unittest.skipUnless(hasattr(multiprocessing, 'get_all_start_methods') and
+            'forkserver' in multiprocessing.get_all_start_methods(),
+            "no forkserver")
+    def test_spawnReplacedByForkserver(self):
+        """
+        Where the default is to spawn, a preloading forkserver is used instead
+        """
+        self.default_method = 'spawn'
+        context = LoggingDaemonlessPool._defaultContext(self.pool)
+        self.assertIs(context, self.contexts['forkserver'])
+        context.set_forkserver_preload.assert_called_once_with(
+                ['green.process', 'colorsys'])
+
+
+    def test_defaultLeftAlone(self):
+        """
+        A default fork or forkserver context is used as it is
+        """
+        for method in ['fork', 'forkserver']:
+            self.contexts.clear()
+            self.default_method = method
+            context = LoggingDaemonlessPool._defaultContext(self.pool)
+            self.assertIs(context, self.contexts[None])
+            self.assertFalse(context.set_forkserver_preload.called)
+
+
+
+class TestPoolInitializerAndFinalizer(unittest.TestCase):
+
+
+    def setUp(self):
+        saved_coverage = process.coverage
+        process.coverage = MagicMock()
+        self.addCleanup(setattr, process, 'coverage', saved_coverage)
+        # These tests may themselves be running in a green pool worker
+        self.addCleanup(setattr, process, 'worker_coverage',
+                        process.worker_coverage)
+        self.addCleanup(setattr, process, 'worker_tempdir',
+                        process.worker_tempdir)
+        process.worker_coverage = None
+        process.worker_tempdir = None
+
+
+    def test_coverageLifetime(self):
+        """
+        Coverage is started by the initializer and saved by the finalizer
+        """
+        poolInitializer(1, ['omitted*'])
+        cov = process.worker_coverage
+        cov.start.assert_called_once_with()
+        self.assertFalse(cov.save.called)
+        poolFinalizer()
+        cov.stop.assert_called_once_with()
+        cov.save.assert_called_once_with()
+        self.assertEqual(process.worker_coverage, None)
+
+
+    def test_coverageDataFileNames(self):
+        """
+        Each worker's coverage data file name gets a suffix unique to it
+        """
+        poolInitializer(1)
+        poolFinalizer()
+        kwargs = process.coverage.coverage.call_args[1]
+        self.assertEqual(kwargs['data_file'], '.coverage.1')
+        self.assertTrue(kwargs['data_suffix'])
+
+
+    def test_noCoverage(self):
+        """
+        Without a coverage number, no coverage is started
+        """
+        poolInitializer()
+        self.assertEqual(process.worker_coverage, None)
+        self.assertFalse(process.coverage.coverage.called)
+        poolFinalizer()
+
+
+    def test_userInitializerAndFinalizer(self):
+        """
+        The user's initializer and finalizer are run
+        """
+        initializer = MagicMock()
+        finalizer = MagicMock()
+        poolInitializer(None, [], initializer)
+        initializer.assert_called_once_with()
+        poolFinalizer(finalizer)
+        finalizer.assert_called_once_with()
+
+
+    def test_tempdirLifetime(self):
+        """
+        The worker's temp directory is created by the initializer and removed
+        by the finalizer
+        """
+        poolInitializer()
+        tempdir = process.worker_tempdir
+        self.assertTrue(os.path.isdir(tempdir))
+        poolFinalizer()
+        self.assertFalse(os.path.exists(tempdir))
+        self.assertEqual(process.worker_tempdir, None)
+
+
+    def test_crashyFinalizerSavesCoverage(self):
+        """
+        Coverage is still saved if the user's finalizer crashes
+        """
+        poolInitializer(1, [])
+        cov = process.worker_coverage
+        finalizer = MagicMock(side_effect=AttributeError)
+        self.assertRaises(AttributeError, poolFinalizer, finalizer)
+        cov.save.assert_called_once_with()
+
+
+
+class TestSeedWorkerTargets(unittest.TestCase):
+
+
+    def test_moduleTargetsSeeded(self):
+        """
+        Module targets get the tests the main process already loaded for them
+        """
+        _restoreWorkerLoadedTests(self)
+        loader = unittest.TestLoader()
+        suite = unittest.TestSuite([
+            loader.loadTestsFromTestCase(TestProcessLogger),
+            loader.loadTestsFromTestCase(TestDaemonlessProcess)])
+        process.worker_loaded_tests['stale.target'] = []
+        process.seedWorkerTargets(suite, [
+            'green.test.test_process',
+            'green.test.test_process.TestDaemonlessProcess'])
+        self.assertEqual(process.worker_loaded_tests, {
+            'green.test.test_process': [
+                (TestProcessLogger, 'test_callThrough'),
+                (TestProcessLogger, 'test_exception'),
+                (TestProcessLogger, 'test_pickle'),
+                (TestDaemonlessProcess, 'test_daemonIsFalse')]})
+
+
+    def test_parallelTargetsSeeded(self):
+        """
+        Tests that were turned into parallel targets are still seeded
+        """
+        _restoreWorkerLoadedTests(self)
+        suite = unittest.TestLoader().loadTestsFromTestCase(
+                TestDaemonlessProcess)
+        targets = toParallelTargets(suite, ['green.test.test_process'])
+        self.assertEqual(targets, ['green.test.test_process'])
+        process.seedWorkerTargets(suite, targets)
+        self.assertEqual(process.worker_loaded_tests, {
+            'green.test.test_process': [
+                (TestDaemonlessProcess, 'test_daemonIsFalse')]})
+
+
+    def test_repeatedTestNotSeeded(self):
+        """
+        A target that loaded the same test more than once is left to the worker
+        """
+        _restoreWorkerLoadedTests(self)
+        suite = unittest.TestSuite([
+            TestDaemonlessProcess('test_daemonIsFalse'),
+            TestDaemonlessProcess('test_daemonIsFalse')])
+        process.seedWorkerTargets(suite, ['green.test.test_process'])
+        self.assertEqual(process.worker_loaded_tests, {})
+
+
+    def test_changedTestNotSeeded(self):
+        """
+        A target with a test that had something set on it is left to the worker
+        """
+        _restoreWorkerLoadedTests(self)
+        test = TestDaemonlessProcess('test_daemonIsFalse')
+        test.param = 1
+        process.seedWorkerTargets(unittest.TestSuite([test]),
+                                  ['green.test.test_process'])
+        self.assertEqual(process.worker_loaded_tests, {})
+
+
+    def test_loadTestsNotSeeded(self):
+        """
+        A module target with a load_tests function is left to the worker
+        """
+        _restoreWorkerLoadedTests(self)
+        module = types.ModuleType(str('green_seed_load_tests'))
+        module.load_tests = lambda loader, tests, pattern: tests
+        sys.modules[module.__name__] = module
+        self.addCleanup(sys.modules.pop, module.__name__)
+        LoadTestsTests = type(str('LoadTestsTests'), (unittest.TestCase,), {
+            '__module__': module.__name__, 'test_x': lambda self: None})
+        suite = unittest.TestSuite([LoadTestsTests('test_x')])
+        process.seedWorkerTargets(suite, [module.__name__])
+        self.assertEqual(process.worker_loaded_tests, {})
+
+
+    def test_packageNotSeeded(self):
+        """
+        A package target is left for the worker to discover
+        """
+        _restoreWorkerLoadedTests(self)
+        PackageTests = type(str('PackageTests'), (unittest.TestCase,), {
+            '__module__': 'green.test', 'test_x': lambda self: None})
+        suite = unittest.TestSuite([PackageTests('test_x')])
+        process.seedWorkerTargets(suite, ['green.test'])
+        self.assertEqual(process.worker_loaded_tests, {})
+
+
+
 class TestPoolRunner(unittest.TestCase):
 
 
@@ -129,9 +622,9 @@ class TestPoolRunner(unittest.TestCase):
         fh.close()
         module_name = basename + '.test_pool_runner_dotted.A.testPass'
         result = Queue()
-        poolRunner(module_name, result, 1)
-        result.get()
-        self.assertEqual(len(result.get().passing), 1)
+        poolRunner(module_name, result)
+        events = result.get()
+        self.assertEqual(len(events[1][1].passing), 1)
 
 
     def test_SyntaxErrorInUnitTest(self):
@@ -154,9 +647,9 @@ class TestPoolRunner(unittest.TestCase):
         fh.close()
         module_name = basename + '.test_pool_syntax_error'
         result = Queue()
-        poolRunner(module_name, result, 1)
-        result.get()
-        self.assertEqual(len(result.get().errors), 1)
+        poolRunner(module_name, result)
+        events = result.get()
+        self.assertEqual(len(events[1][1].errors), 1)
 
 
     def test_error(self):
@@ -183,7 +676,289 @@ class TestPoolRunner(unittest.TestCase):
         module_name = basename + '.test_pool_runner_dotted_fail.A.testError'
         result = Queue()
         poolRunner(module_name, result)
-        result.get()
-        self.assertEqual(len(result.get().errors), 1)
+        events = result.get()
+        self.assertEqual(len(events[1][1].errors), 1)
+
+
+
+
+    def test_batchOfTargets(self):
+        """
+        A list of targets are all run before the sentinel is sent
+        """
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_batch.py'), 'w')
+        fh.write(dedent(
+            """
+            import unittest
+            class A(unittest.TestCase):
+                def testPass(self):
+                    pass
+                def testFail(self):
+                    self.fail()
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_batch.A'
+        result = Queue()
+        poolRunner([module_name + '.testPass', module_name + '.testFail'],
+                   result)
+        events = result.get()
+        self.assertEqual([kind for kind, msg in events],
+                         ['start', 'stop', 'start', 'stop'])
+        self.assertEqual(events[0][1].method_name, 'testPass')
+        self.assertEqual(len(events[1][1].passing), 1)
+        self.assertEqual(events[2][1].method_name, 'testFail')
+        self.assertEqual(len(events[3][1].failures), 1)
+        self.assertEqual(result.get(), None)
+
+
+    def test_batchFixturesTornDownOnce(self):
+        """
+        Class and module fixtures of a target in a batch are torn down once
+        """
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        log_path = os.path.join(self.tmpdir, 'fixtures.log')
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        for name in ['a', 'b']:
+            fh = open(os.path.join(basename, 'test_{}.py'.format(name)), 'w')
+            fh.write(dedent(
+                """
+                import unittest
+                def log(message):
+                    with open({log_path!r}, 'a') as fh:
+                        fh.write(message + '\\n')
+                def tearDownModule():
+                    log('TDM {name}')
+                class {upper}(unittest.TestCase):
+                    @classmethod
+                    def tearDownClass(cls):
+                        log('TDC {upper}')
+                    def testPass(self):
+                        pass
+                """.format(log_path=log_path, name=name, upper=name.upper())))
+            fh.close()
+        result = Queue()
+        poolRunner([basename + '.test_a', basename + '.test_b'], result)
+        events = result.get()
+        self.assertEqual(len([kind for kind, msg in events if kind == 'stop']),
+                         2)
+        self.assertEqual(result.get(), None)
+        fh = open(log_path)
+        self.assertEqual(fh.read().split(),
+                         ['TDC', 'A', 'TDM', 'a', 'TDC', 'B', 'TDM', 'b'])
+        fh.close()
+
+
+    def test_eventsFlushed(self):
+        """
+        Buffered events are sent once the buffer fills up
+        """
+        saved_event_buffer_size = process.event_buffer_size
+        process.event_buffer_size = 2
+        self.addCleanup(setattr, process, 'event_buffer_size',
+                        saved_event_buffer_size)
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_flush.py'), 'w')
+        fh.write(dedent(
+            """
+            import unittest
+            class A(unittest.TestCase):
+                def testOne(self):
+                    pass
+                def testTwo(self):
+                    pass
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_flush'
+        result = Queue()
+        poolRunner(module_name, result)
+        self.assertEqual(len(result.get()), 2)
+        self.assertEqual(len(result.get()), 2)
+        self.assertEqual(result.get(), None)
+
+
+    def test_capturedOutputSentWithItsResult(self):
+        """
+        Each test's result carries the output captured from that test only
+        """
+        saved_event_buffer_size = process.event_buffer_size
+        process.event_buffer_size = 2
+        self.addCleanup(setattr, process, 'event_buffer_size',
+                        saved_event_buffer_size)
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_output.py'), 'w')
+        fh.write(dedent(
+            """
+            import unittest
+            class A(unittest.TestCase):
+                def testOne(self):
+                    print('one')
+                def testTwo(self):
+                    print('two')
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_output'
+        result = Queue()
+        poolRunner(module_name, result)
+        outputs = []
+        for events in iter(result.get, None):
+            for kind, msg in events:
+                if kind == 'stop':
+                    outputs.append(list(msg.stdout_output.values()))
+        self.assertEqual(outputs, [['one\n'], ['two\n']])
+
+
+    def test_workerTempdir(self):
+        """
+        Tests run with the worker's temp directory, which is restored afterwards
+        """
+        saved_worker_tempdir = process.worker_tempdir
+        process.worker_tempdir = tempfile.mkdtemp(dir=self.tmpdir)
+        self.addCleanup(setattr, process, 'worker_tempdir',
+                        saved_worker_tempdir)
+        saved_tempdir = tempfile.tempdir
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_tempdir.py'), 'w')
+        fh.write(dedent(
+            """
+            import tempfile
+            import unittest
+            class A(unittest.TestCase):
+                def testTempdir(self):
+                    tempfile.mkstemp()
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_tempdir'
+        result = Queue()
+        poolRunner(module_name, result)
+        events = result.get()
+        self.assertEqual(len(events[1][1].passing), 1)
+        self.assertEqual(len(os.listdir(process.worker_tempdir)), 1)
+        self.assertEqual(tempfile.tempdir, saved_tempdir)
+
+
+    def test_seededTargetNotLoaded(self):
+        """
+        A target whose tests were seeded is run without loading it again
+        """
+        _restoreWorkerLoadedTests(self)
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_seeded.py'), 'w')
+        fh.write(dedent(
+            """
+            import unittest
+            class A(unittest.TestCase):
+                def testPass(self):
+                    pass
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_seeded'
+        process.seedWorkerTargets(process.loadTargets(module_name),
+                                  [module_name])
+        saved_loadTargets = process.loadTargets
+        process.loadTargets = MagicMock()
+        self.addCleanup(setattr, process, 'loadTargets', saved_loadTargets)
+        result = Queue()
+        poolRunner(module_name, result)
+        events = result.get()
+        self.assertEqual(len(events[1][1].passing), 1)
+        self.assertFalse(process.loadTargets.called)
 
 
+    def test_loadTestsParametersKept(self):
+        """
+        Tests that a module's load_tests set up are run as they were loaded
+        """
+        _restoreWorkerLoadedTests(self)
+        # Parent directory setup
+        os.chdir(self.tmpdir)
+        sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+        basename = os.path.basename(sub_tmpdir)
+        # Child setup
+        fh = open(os.path.join(basename, '__init__.py'), 'w')
+        fh.write('\n')
+        fh.close()
+        fh = open(os.path.join(basename, 'test_pool_runner_params.py'), 'w')
+        fh.write(dedent(
+            """
+            import unittest
+            class ParamTest(unittest.TestCase):
+                def test_it(self):
+                    self.assertTrue(hasattr(self, 'param'))
+            def load_tests(loader, tests, pattern):
+                suite = unittest.TestSuite()
+                for param in range(3):
+                    t = ParamTest('test_it')
+                    t.param = param
+                    suite.addTest(t)
+                return suite
+            """))
+        fh.close()
+        module_name = basename + '.test_pool_runner_params'
+        process.seedWorkerTargets(process.loadTargets(module_name),
+                                  [module_name])
+        result = Queue()
+        poolRunner(module_name, result)
+        events = result.get()
+        results = [event[1] for event in events if event[0] == 'stop']
+        self.assertEqual(len(results), 3)
+        for test_result in results:
+            self.assertEqual(len(test_result.passing), 1)
+
+
+    def test_unrunnableTarget(self):
+        """
+        A target that doesn't load as anything runnable is reported as an error
+        """
+        saved_loadTargets = process.loadTargets
+        process.loadTargets = MagicMock(return_value=None)
+        self.addCleanup(setattr, process, 'loadTargets', saved_loadTargets)
+        result = Queue()
+        poolRunner('nonexistent_pkg.module.SomeClass.someMethod', result)
+        events = result.get()
+        test = events[0][1]
+        self.assertEqual(test.module, 'nonexistent_pkg.module')
+        self.assertEqual(test.class_name, 'SomeClass')
+        self.assertEqual(test.method_name, 'someMethod')
+        self.assertEqual(len(events[1][1].errors), 1)
@@ -1,12 +1,13 @@
 from __future__ import unicode_literals
 import copy
+import pickle
 import sys
 import unittest
 
 from green.config import default_args
 from green.output import Colors, GreenStream
 from green.result import GreenTestResult, proto_test, \
-        ProtoTest, proto_error, ProtoTestResult, BaseTestResult
+        ProtoTest, proto_error, ProtoTestResult, BaseTestResult, PickleBuffer
 
 try:
     from io import StringIO
@@ -108,6 +109,30 @@ class TestBaseTestResult(unittest.TestCase):
 class TestProtoTestResult(unittest.TestCase):
 
 
+    def test_pickleOutOfBand(self):
+        """
+        Large captured output is pickled out-of-band, and comes back as text
+        """
+        if not PickleBuffer:
+            self.skipTest('Requires pickle protocol 5')
+        ptr = ProtoTestResult()
+        test = MyProtoTest()
+        ptr.stdout_output[test] = 'x' * 10000
+        ptr.stderr_errput[test] = 'little'
+        buffers = []
+        data = pickle.dumps(ptr, 5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+        self.assertLess(len(data), 10000)
+        new_ptr = pickle.loads(
+                data, buffers=[b.raw().tobytes() for b in buffers])
+        self.assertEqual(new_ptr.stdout_output[test], 'x' * 10000)
+        self.assertEqual(new_ptr.stderr_errput[test], 'little')
+        # Pickling in-band works too, and leaves the original alone
+        new_ptr = pickle.loads(pickle.dumps(ptr, 5))
+        self.assertEqual(new_ptr.stdout_output[test], 'x' * 10000)
+        self.assertEqual(ptr.stdout_output[test], 'x' * 10000)
+
+
     def test_addSuccess(self):
         """
         addSuccess adds a test correctly
@@ -216,6 +241,19 @@ class TestProtoTest(unittest.TestCase):
             self.assertEqual(locals()[i], getattr(pt, i, None))
 
 
+    def test_protoTestCached(self):
+        """
+        proto_test() makes only one ProtoTest per test
+        """
+        class Small(unittest.TestCase):
+            def test_method(self):
+                pass
+        test = Small('test_method')
+        pt = proto_test(test)
+        self.assertIs(proto_test(test), pt)
+        self.assertIsNot(proto_test(Small('test_method')), pt)
+
+
     def test_getDescription(self):
         """
         getDescription() returns what we expect for all verbose levels
@@ -431,6 +431,32 @@ class TestProcesses(unittest.TestCase):
         os.chdir(TestProcesses.startdir)
         self.assertIn('OK', self.stream.getvalue())
 
+    def test_maxtasksperchild(self):
+        """
+        Worker processes can be replaced while running tests.
+        """
+        for name in ['one', 'two', 'three']:
+            sub_tmpdir = tempfile.mkdtemp(dir=self.tmpdir)
+            fh = open(os.path.join(sub_tmpdir, '__init__.py'), 'w')
+            fh.write('\n')
+            fh.close()
+            fh = open(os.path.join(sub_tmpdir, 'test_{}.py'.format(name)), 'w')
+            fh.write(dedent(
+                """
+                import unittest
+                class A(unittest.TestCase):
+                    def testPasses(self):
+                        pass"""))
+            fh.close()
+        # Load the tests
+        os.chdir(self.tmpdir)
+        tests = loadTargets('.')
+        self.args.processes = 1
+        self.args.maxtasksperchild = 1
+        run(tests, self.stream, self.args)
+        os.chdir(TestProcesses.startdir)
+        self.assertIn('OK (passes=3)', self.stream.getvalue())
+
     def test_runCoverage(self):
         """
         Running coverage in process mode doesn't crash